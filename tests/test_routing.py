@@ -1,8 +1,11 @@
 import importlib
 import re
+import sys
 from collections.abc import Awaitable, Callable
 from contextvars import ContextVar
+from dataclasses import dataclass
 from datetime import date
+from enum import Enum
 from typing import Annotated, Any, NewType, TypeAlias, cast, get_args
 
 import pytest
@@ -254,6 +257,136 @@ def test__endpoint_had(
     assert getattr(routes_2001[0], attr) != attr_value
 
 
+def test__endpoint_had__tags_of_other_versions_are_not_affected(
+    router: VersionedAPIRouter,
+    create_versioned_api_routes: CreateVersionedAPIRoutes,
+):
+    @router.get("/test", tags=["foo"])
+    async def test_endpoint():
+        raise NotImplementedError
+
+    routes_2000, routes_2001 = create_versioned_api_routes(endpoint("/test", ["GET"]).had(tags=["bar"]))
+
+    assert routes_2000[0] is not routes_2001[0]
+    assert routes_2000[0].tags == ["bar"]
+    assert routes_2001[0].tags == ["foo"]
+
+
+def test__endpoint_had__route_containers_of_other_versions_are_not_affected(
+    router: VersionedAPIRouter,
+    create_versioned_api_routes: CreateVersionedAPIRoutes,
+):
+    @router.get(
+        "/test",
+        responses={404: {"description": "Not found"}},
+        openapi_extra={"foo": "bar"},
+        response_model_include={"foo"},
+    )
+    async def test_endpoint():
+        raise NotImplementedError
+
+    routes_2000, routes_2001 = create_versioned_api_routes(endpoint("/test", ["GET"]).had(description="bar"))
+
+    routes_2000[0].responses[500] = {"description": "Internal error"}
+    routes_2000[0].openapi_extra["foo"] = "baz"
+    routes_2000[0].response_model_include.add("bar")
+    routes_2000[0].methods.add("HEAD")
+
+    assert routes_2001[0].responses == {404: {"description": "Not found"}}
+    assert routes_2001[0].openapi_extra == {"foo": "bar"}
+    assert routes_2001[0].response_model_include == {"foo"}
+    assert routes_2001[0].methods == {"GET"}
+
+
+def test__router_generation__router_attributes_of_other_versions_are_not_affected(
+    test_endpoint: Endpoint,
+    create_versioned_copies: CreateVersionedCopies,
+):
+    routers = create_versioned_copies()
+    router_2000, router_2001 = routers[date(2000, 1, 1)], routers[date(2001, 1, 1)]
+
+    router_2000.add_event_handler("startup", lambda: None)
+    router_2000.dependencies.append(Depends(lambda: None))
+    router_2000.tags.append("foo")
+    router_2000.responses[404] = {"description": "Not found"}
+
+    assert router_2001.on_startup == []
+    assert router_2001.dependencies == []
+    assert router_2001.tags == []
+    assert router_2001.responses == {}
+    assert router_2000.lifespan_context._router is router_2000
+    assert router_2001.lifespan_context._router is router_2001
+    assert router_2000.default.__self__ is router_2000
+    assert router_2001.default.__self__ is router_2001
+
+
+def test__endpoint_had__changing_path_and_then_changing_the_endpoint_by_its_new_path(
+    test_endpoint: Endpoint,
+    test_path: str,
+    create_versioned_api_routes: CreateVersionedAPIRoutes,
+):
+    routes_2000, routes_2001 = create_versioned_api_routes(
+        endpoint(test_path, ["GET"]).had(path="/new_test/{hewwo}"),
+        endpoint("/new_test/{hewwo}", ["GET"]).had(name="my name"),
+    )
+
+    assert routes_2000[0].path == "/new_test/{hewwo}"
+    assert routes_2000[0].name == "my name"
+    assert routes_2001[0].path == test_path
+    assert routes_2001[0].name == "test"
+
+
+@pytest.mark.skipif(sys.version_info < (3, 11), reason="http.HTTPMethod was added in Python 3.11")
+def test__endpoint_had__http_method_enum(
+    test_endpoint: Endpoint,
+    test_path: str,
+    create_versioned_api_routes: CreateVersionedAPIRoutes,
+):
+    from http import HTTPMethod
+
+    routes_2000, routes_2001 = create_versioned_api_routes(
+        endpoint(test_path, [HTTPMethod.GET]).had(name="my name"),
+    )
+
+    assert routes_2000[0].name == "my name"
+    assert routes_2001[0].name == "test"
+
+
+def test__endpoint_had__str_enum_path_and_method(
+    test_endpoint: Endpoint,
+    test_path: str,
+    create_versioned_api_routes: CreateVersionedAPIRoutes,
+):
+    class StrPath(str, Enum):
+        TEST = test_path
+
+    class StrMethod(str, Enum):
+        GET = "GET"
+
+    routes_2000, routes_2001 = create_versioned_api_routes(
+        endpoint(StrPath.TEST, [StrMethod.GET]).had(name="my name"),
+    )
+
+    assert routes_2000[0].name == "my name"
+    assert routes_2001[0].name == "test"
+
+
+def test__endpoint_had__changing_methods_and_then_changing_the_endpoint_by_its_new_methods(
+    test_endpoint: Endpoint,
+    test_path: str,
+    create_versioned_api_routes: CreateVersionedAPIRoutes,
+):
+    routes_2000, routes_2001 = create_versioned_api_routes(
+        endpoint(test_path, ["GET"]).had(methods=["GET", "POST"]),
+        endpoint(test_path, ["GET", "POST"]).had(name="my name"),
+    )
+
+    assert set(routes_2000[0].methods) == {"GET", "POST"}
+    assert routes_2000[0].name == "my name"
+    assert routes_2001[0].methods == {"GET"}
+    assert routes_2001[0].name == "test"
+
+
 def test__endpoint_only_exists_in_older_versions__endpoint_is_not_a_route__error(
     router: VersionedAPIRouter,
     test_endpoint: Endpoint,
@@ -780,6 +913,91 @@ def test__router_generation__using_unversioned_models(
 
     assert routes_2000[2].dependant.body_params[0].type_ is UnversionedSchema3
     assert routes_2001[2].dependant.body_params[0].type_ is UnversionedSchema3
+    # Nothing had to be migrated so the endpoints must not have been wrapped again
+    assert routes_2000[0].endpoint is routes_2001[0].endpoint
+    assert routes_2000[1].endpoint is routes_2001[1].endpoint
+    assert routes_2000[2].endpoint is routes_2001[2].endpoint
+
+
+def test__router_generation__route_without_versioned_types__dependant_is_reused(
+    router: VersionedAPIRouter,
+    _reload_autogenerated_modules: None,
+    generate_test_version_packages: GenerateTestVersionPackages,
+    create_versioned_api_routes: CreateVersionedAPIRoutes,
+):
+    @router.post("/test")
+    async def test(body: UnversionedSchema1):
+        raise NotImplementedError
+
+    generate_test_version_packages()
+    routes_2000, routes_2001 = create_versioned_api_routes(latest_schemas_module=latest)
+
+    assert routes_2000[0].dependant is routes_2001[0].dependant
+    assert routes_2000[0].body_field is routes_2001[0].body_field
+    assert routes_2000[0].app is routes_2001[0].app
+
+
+@pytest.mark.parametrize(
+    ("change_status_code", "change_dependencies"),
+    [(True, False), (False, True), (True, True)],
+)
+def test__router_generation__endpoint_had_status_code_or_dependencies__route_handler_is_rebuilt(
+    change_status_code: bool,
+    change_dependencies: bool,
+    router: VersionedAPIRouter,
+    _reload_autogenerated_modules: None,
+    generate_test_version_packages: GenerateTestVersionPackages,
+    create_versioned_api_routes: CreateVersionedAPIRoutes,
+):
+    @router.post("/test")
+    async def test(body: UnversionedSchema1):
+        raise NotImplementedError
+
+    async def dependency():
+        raise NotImplementedError
+
+    attributes: dict[str, Any] = {}
+    if change_status_code:
+        attributes["status_code"] = 201
+    if change_dependencies:
+        attributes["dependencies"] = [Depends(dependency)]
+
+    generate_test_version_packages()
+    routes_2000, routes_2001 = create_versioned_api_routes(
+        endpoint("/test", ["POST"]).had(**attributes),
+        latest_schemas_module=latest,
+    )
+
+    assert routes_2000[0].dependant is not routes_2001[0].dependant
+    assert routes_2000[0].app is not routes_2001[0].app
+    assert [d.call for d in routes_2000[0].dependant.dependencies] == ([dependency] if change_dependencies else [])
+    assert routes_2001[0].dependant.dependencies == []
+
+
+def test__router_generation__using_unhashable_callable_dependency(
+    router: VersionedAPIRouter,
+    _reload_autogenerated_modules: None,
+    generate_test_version_packages: GenerateTestVersionPackages,
+    create_versioned_api_routes: CreateVersionedAPIRoutes,
+):
+    @dataclass
+    class UnhashableDependency:
+        value: int
+
+        async def __call__(self, body: UnversionedSchema1) -> int:
+            return self.value
+
+    dependency = UnhashableDependency(83)
+
+    @router.post("/test")
+    async def test(dep: int = Depends(dependency, use_cache=False)):
+        raise NotImplementedError
+
+    generate_test_version_packages()
+    routes_2000, routes_2001 = create_versioned_api_routes(latest_schemas_module=latest)
+
+    assert routes_2000[0].dependant.dependencies[0].call is dependency
+    assert routes_2001[0].dependant.dependencies[0].call is dependency
 
 
 def test__router_generation__using_weird_typehints(
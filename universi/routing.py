@@ -1,18 +1,19 @@
+import copy
 import datetime
 import functools
 import inspect
+import sys
 import typing
 import warnings
 from collections.abc import Callable, Sequence
-from copy import deepcopy
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
-from types import GenericAlias, MappingProxyType, ModuleType
+from types import GenericAlias, MappingProxyType, MethodType, ModuleType
 from typing import (
     Any,
     Callable,
-    Collection,
+    ClassVar,
     Dict,
     List,
     Optional,
@@ -22,7 +23,6 @@ from typing import (
     TypeVar,
     _BaseGenericAlias,  # pyright: ignore[reportGeneralTypeIssues]
     Union,  # pyright: ignore[reportGeneralTypeIssues]
-    cast,
     get_args,
     get_origin,
 )
@@ -50,8 +50,8 @@ from starlette.routing import (
 )
 from typing_extensions import Self, assert_never, deprecated
 
-from universi._utils import Sentinel, UnionType, get_another_version_of_cls
-from universi.codegen import _get_package_path_from_module, _get_version_dir_path
+from universi._utils import UnionType, get_another_version_of_cls
+from universi.codegen import _get_package_path_from_module, _get_version_dir_name
 from universi.exceptions import RouteAlreadyExistsError, RouterGenerationError, UniversiError
 from universi.structure import Version, VersionBundle
 from universi.structure.common import Endpoint, VersionDate
@@ -66,6 +66,17 @@ from universi.structure.versions import VersionChange
 _T = TypeVar("_T", bound=Callable[..., Any])
 # This is a hack we do because we can't guarantee how the user will use the router.
 _DELETED_ROUTE_TAG = "_UNIVERSI_DELETED_ROUTE"
+_ROUTE_CONTAINER_ATTRIBUTES = (
+    "tags",
+    "dependencies",
+    "responses",
+    "openapi_extra",
+    "callbacks",
+    "methods",
+    "response_model_include",
+    "response_model_exclude",
+)
+_EMPTY = inspect.Signature.empty
 
 
 @dataclass(slots=True, frozen=True, eq=True)
@@ -124,27 +135,30 @@ class _EndpointTransformer:
             self.annotation_transformer = _AnnotationTransformer(latest_schemas_module, versions)
         else:
             self.annotation_transformer = None
-
-        self.routes_that_never_existed = [
-            route for route in parent_router.routes if isinstance(route, APIRoute) and _DELETED_ROUTE_TAG in route.tags
-        ]
+        self.routes_that_never_existed: list[APIRoute] = []
 
     def transform(self):
         router = self.parent_router
+        router._api_routes = [route for route in router.routes if isinstance(route, APIRoute)]
+        # Instructions intern their paths and methods too so route lookups can compare strings by identity
+        for route in router._api_routes:
+            route.path = sys.intern(str.__str__(route.path))
+            route.methods = {sys.intern(str.__str__(method)) for method in route.methods}
+            # The tag is the only thing that survives the user including routers into each other
+            # but checking a flag is cheaper than searching through the tags every time
+            route._deleted = _DELETED_ROUTE_TAG in route.tags
+        self.routes_that_never_existed = [route for route in router._api_routes if route._deleted]
         routers: dict[VersionDate, fastapi.routing.APIRouter] = {}
+        # Versions can't be generated in parallel: each router is a copy of the router of the newer version with
+        # that version's changes applied to it. Annotation transformer's caches also rely on being filled
+        # sequentially to guarantee that we never create two copies of the same migrated object.
         for version in self.versions:
             if self.annotation_transformer:
                 self.annotation_transformer.migrate_router_to_version(router, version)
 
             routers[version.value] = router
-            router = deepcopy(router)
+            router = _clone_router_and_remove_deleted_routes(router)
             self._apply_endpoint_changes_to_router(router, version)
-
-            routers[version.value].routes = [
-                route
-                for route in routers[version.value].routes
-                if not (isinstance(route, fastapi.routing.APIRoute) and _DELETED_ROUTE_TAG in route.tags)
-            ]
         if self.routes_that_never_existed:
             raise RouterGenerationError(
                 "Every route you mark with "
@@ -160,32 +174,30 @@ class _EndpointTransformer:
         router: fastapi.routing.APIRouter,
         version: Version,
     ):  # noqa: C901
-        routes = router.routes
+        routes = _build_route_index(router._api_routes)
         for version_change in version.version_changes:
             for instruction in version_change.alter_endpoint_instructions:
+                methods_we_should_have_applied_changes_to = frozenset(instruction.endpoint_methods)
                 original_routes = _get_routes(
                     routes,
                     instruction.endpoint_path,
-                    instruction.endpoint_methods,
+                    methods_we_should_have_applied_changes_to,
                     instruction.endpoint_func_name,
                     is_deleted=False,
                 )
                 methods_to_which_we_applied_changes = set()
-                methods_we_should_have_applied_changes_to = set(instruction.endpoint_methods)
 
                 if isinstance(instruction, EndpointDidntExistInstruction):
                     # TODO: Optimize me
                     deleted_routes = _get_routes(
                         routes,
                         instruction.endpoint_path,
-                        instruction.endpoint_methods,
+                        methods_we_should_have_applied_changes_to,
                         instruction.endpoint_func_name,
                         is_deleted=True,
                     )
                     if deleted_routes:
-                        method_union = set()
-                        for deleted_route in deleted_routes:
-                            method_union |= deleted_route.methods
+                        method_union = frozenset().union(*(r._methods_fs for r in deleted_routes))
                         raise RouterGenerationError(
                             f'Endpoint "{list(method_union)} {instruction.endpoint_path}" you tried to delete in '
                             f'"{version_change.__name__}" was already deleted in a newer version. If you really have '
@@ -194,8 +206,9 @@ class _EndpointTransformer:
                             f"{[r.endpoint.__name__ for r in deleted_routes]}",
                         )
                     for original_route in original_routes:
-                        methods_to_which_we_applied_changes |= original_route.methods
+                        methods_to_which_we_applied_changes |= original_route._methods_fs
                         original_route.tags.append(_DELETED_ROUTE_TAG)
+                        original_route._deleted = True
                     err = (
                         'Endpoint "{endpoint_methods} {endpoint_path}" you tried to delete in'
                         ' "{version_change_name}" doesn\'t exist in a newer version'
@@ -203,9 +216,7 @@ class _EndpointTransformer:
                 elif isinstance(instruction, EndpointExistedInstruction):
                     # TODO: Optimize me
                     if original_routes:
-                        method_union = set()
-                        for original_route in original_routes:
-                            method_union |= original_route.methods
+                        method_union = frozenset().union(*(r._methods_fs for r in original_routes))
                         raise RouterGenerationError(
                             f'Endpoint "{list(method_union)} {instruction.endpoint_path}" you tried to restore in'
                             f' "{version_change.__name__}" already existed in a newer version. If you really have two '
@@ -216,7 +227,7 @@ class _EndpointTransformer:
                     deleted_routes = _get_routes(
                         routes,
                         instruction.endpoint_path,
-                        instruction.endpoint_methods,
+                        methods_we_should_have_applied_changes_to,
                         instruction.endpoint_func_name,
                         is_deleted=True,
                     )
@@ -231,8 +242,9 @@ class _EndpointTransformer:
                             f"endpoints that can be restored: {[r.endpoint.__name__ for r in e.routes]}",
                         ) from e
                     for deleted_route in deleted_routes:
-                        methods_to_which_we_applied_changes |= deleted_route.methods
+                        methods_to_which_we_applied_changes |= deleted_route._methods_fs
                         deleted_route.tags.remove(_DELETED_ROUTE_TAG)
+                        deleted_route._deleted = False
 
                         if deleted_route in self.routes_that_never_existed:
                             self.routes_that_never_existed.remove(deleted_route)
@@ -242,8 +254,11 @@ class _EndpointTransformer:
                     )
                 elif isinstance(instruction, EndpointHadInstruction):
                     for original_route in original_routes:
-                        methods_to_which_we_applied_changes |= original_route.methods
+                        methods_to_which_we_applied_changes |= original_route._methods_fs
                         _apply_endpoint_had_instruction(version_change, instruction, original_route)
+                        if original_route.path != instruction.endpoint_path:
+                            routes[instruction.endpoint_path].remove(original_route)
+                            routes.setdefault(original_route.path, []).append(original_route)
                     err = (
                         'Endpoint "{endpoint_methods} {endpoint_path}" you tried to change in'
                         ' "{version_change_name}" doesn\'t exist'
@@ -251,16 +266,14 @@ class _EndpointTransformer:
                 elif isinstance(instruction, EndpointWasInstruction):
                     # TODO: Add test for changing dependant and checking that the schemas used in the dependant have been migrated to the correct version
                     for original_route in original_routes:
-                        methods_to_which_we_applied_changes |= original_route.methods
+                        methods_to_which_we_applied_changes |= original_route._methods_fs
                         original_response_model = original_route.endpoint.response_model
 
                         original_route.endpoint = instruction.get_old_endpoint()
                         _remake_endpoint_dependencies(original_route)
                         original_dependant = original_route.dependant
                         if self.annotation_transformer:
-                            version_dir = _get_version_dir_path(
-                                self.annotation_transformer.latest_schemas_module, version.value
-                            )
+                            version_dir = self.annotation_transformer.version_dirs_by_date[version.value]
                             self.annotation_transformer.migrate_route_to_version(
                                 original_route, version_dir, ignore_response_model=True
                             )
@@ -291,7 +304,7 @@ def _validate_no_repetitions_in_routes(routes: list[fastapi.routing.APIRoute]):
     route_map = {}
 
     for route in routes:
-        route_info = _EndpointInfo(route.path, frozenset(route.methods))
+        route_info = _EndpointInfo(route.path, route._methods_fs)
         if route_info in route_map:
             raise RouteAlreadyExistsError(route, route_map[route_info])
         route_map[route_info] = route
@@ -301,9 +314,15 @@ class _AnnotationTransformer:
     __slots__ = (
         "latest_schemas_module",
         "version_dirs",
+        "version_dirs_by_date",
         "template_version_dir",
         "latest_version_dir",
-        "change_versions_of_a_non_container_annotation",
+        "_version_dir_strs",
+        "_template_dir_str",
+        "_dir_with_versions_str",
+        "_non_container_cache",
+        "_container_cache",
+        "_parameters_cache",
     )
 
     def __init__(self, latest_schemas_module: ModuleType, versions: VersionBundle) -> None:
@@ -317,33 +336,41 @@ class _AnnotationTransformer:
                 f'Received "{latest_schemas_module.__name__}" instead.',
             )
         self.latest_schemas_module = latest_schemas_module
-        self.version_dirs = frozenset(
-            [_get_package_path_from_module(latest_schemas_module)]
-            + [_get_version_dir_path(latest_schemas_module, version.value) for version in versions],
-        )
+        # Finding the package path of a module is slow so we only do it once and derive every version dir from it
+        template_dir = _get_package_path_from_module(latest_schemas_module)
+        self.version_dirs_by_date = {
+            version.value: template_dir.with_name(_get_version_dir_name(version.value)) for version in versions
+        }
+        self.version_dirs = frozenset([template_dir, *self.version_dirs_by_date.values()])
         # Okay, the naming is confusing, I know. Essentially template_version_dir is a dir of
         # latest_schemas_module while latest_version_dir is a version equivalent to latest but
         # with its own directory. Pick a better naming and make a PR, I am at your mercy.
         self.template_version_dir = min(self.version_dirs)  # "latest" < "v0000_00_00"
         self.latest_version_dir = max(self.version_dirs)  # "v2005_11_11" > "v2000_11_11"
+        # We check where every versioned type is defined so we precompute the paths we compare against
+        self._version_dir_strs = tuple(str(d) for d in self.version_dirs)
+        self._template_dir_str = str(self.template_version_dir)
+        self._dir_with_versions_str = str(self.template_version_dir.parent)
 
         # This cache is not here for speeding things up. It's for preventing the creation of copies of the same object
         # because such copies could produce weird behaviors at runtime, especially if you/fastapi do any comparisons.
         # It's defined here and not on the method because of this: https://youtu.be/sVjtp6tGo0g
-        self.change_versions_of_a_non_container_annotation = functools.cache(
-            self._change_versions_of_a_non_container_annotation,
-        )
+        self._non_container_cache: dict[Path, dict[Any, Any]] = {version_dir: {} for version_dir in self.version_dirs}
+        # Containers are not hashable so we key them by id. The original container is stored next to the result
+        # to make sure that its id does not get reused by another object while the cache is alive.
+        self._container_cache: dict[tuple[int, Path], tuple[Any, Any]] = {}
+        # inspect.signature is slow and we need the parameters of the same callable for every version
+        self._parameters_cache: dict[Callable, MappingProxyType[str, inspect.Parameter]] = {}
 
     def migrate_router_to_version(self, router: fastapi.routing.APIRouter, version: Version):
-        version_dir = _get_version_dir_path(self.latest_schemas_module, version.value)
+        version_dir = self.version_dirs_by_date[version.value]
         if not version_dir.is_dir():
             raise RouterGenerationError(
                 f"Versioned schema directory '{version_dir}' does not exist.",
             )
-        for route in router.routes:
-            if not isinstance(route, fastapi.routing.APIRoute):
-                continue
+        for route in router._api_routes:
             self.migrate_route_to_version(route, version_dir)
+        self._container_cache.clear()
 
     def migrate_route_to_version(
         self, route: fastapi.routing.APIRoute, version_dir: Path, *, ignore_response_model: bool = False
@@ -354,58 +381,73 @@ class _AnnotationTransformer:
         route.endpoint = self._change_version_of_annotations(route.endpoint, version_dir)
         _remake_endpoint_dependencies(route)
 
+    def change_versions_of_a_non_container_annotation(self, annotation: Any, version_dir: Path) -> Any:
+        cache = self._non_container_cache[version_dir]
+        try:
+            return cache[annotation]
+        except KeyError:
+            pass
+        except TypeError:
+            # Unhashable annotations can't be cached so we just migrate them every time
+            return self._change_versions_of_a_non_container_annotation(annotation, version_dir)
+        new_annotation = cache[annotation] = self._change_versions_of_a_non_container_annotation(
+            annotation,
+            version_dir,
+        )
+        return new_annotation
+
+    def _get_parameters(self, func: Callable) -> MappingProxyType[str, inspect.Parameter]:
+        try:
+            return self._parameters_cache[func]
+        except KeyError:
+            pass
+        except TypeError:
+            # Unhashable callables can't be cached
+            return inspect.signature(func).parameters
+        parameters = self._parameters_cache[func] = inspect.signature(func).parameters
+        return parameters
+
     def _change_versions_of_a_non_container_annotation(self, annotation: Any, version_dir: Path) -> Any:
+        # We return the original annotation whenever nothing in it changed to avoid creating needless copies of it
         if isinstance(annotation, _BaseGenericAlias | GenericAlias):
-            return get_origin(annotation)[
-                tuple(self._change_version_of_annotations(arg, version_dir) for arg in get_args(annotation))
-            ]
+            args = get_args(annotation)
+            new_args = self._change_version_of_annotations(args, version_dir)
+            if new_args is args:
+                return annotation
+            return get_origin(annotation)[new_args]
         elif isinstance(annotation, Depends):
-            return Depends(
-                self._change_version_of_annotations(annotation.dependency, version_dir),
-                use_cache=annotation.use_cache,
-            )
+            new_dependency = self._change_version_of_annotations(annotation.dependency, version_dir)
+            if new_dependency is annotation.dependency:
+                return annotation
+            return Depends(new_dependency, use_cache=annotation.use_cache)
         elif isinstance(annotation, UnionType):
+            args = get_args(annotation)
+            new_args = self._change_version_of_annotations(args, version_dir)
+            if new_args is args:
+                return annotation
             getitem = typing.Union.__getitem__  # pyright: ignore[reportGeneralTypeIssues]
-            return getitem(
-                tuple(self._change_version_of_annotations(a, version_dir) for a in get_args(annotation)),
-            )
+            return getitem(new_args)
         elif annotation is typing.Any or isinstance(annotation, typing.NewType):
             return annotation
         elif isinstance(annotation, type):
             return self._change_version_of_type(annotation, version_dir)
         elif callable(annotation):
-            if inspect.iscoroutinefunction(annotation):
-
-                @functools.wraps(annotation)
-                async def new_callable(  # pyright: ignore[reportGeneralTypeIssues]
-                    *args: Any,
-                    **kwargs: Any,
-                ) -> Any:
-                    return await annotation(*args, **kwargs)
+            old_params = self._get_parameters(annotation)
+            callable_annotations = getattr(annotation, "__annotations__", {})
+            if not old_params and not callable_annotations:
+                return annotation
+            new_annotations = self._change_version_of_annotations(callable_annotations, version_dir)
+            defaults = tuple(p.default for p in old_params.values() if p.default is not _EMPTY)
+            new_defaults = self._change_version_of_annotations(defaults, version_dir)
+            if new_annotations is callable_annotations and new_defaults is defaults:
+                return annotation
 
+            if inspect.iscoroutinefunction(annotation):
+                new_callable = _wrap_async_callable(annotation)
             else:
-
-                @functools.wraps(annotation)
-                def new_callable(  # pyright: ignore[reportGeneralTypeIssues]
-                    *args: Any,
-                    **kwargs: Any,
-                ) -> Any:
-                    return annotation(*args, **kwargs)
-
-            # Otherwise it will have the same signature as __wrapped__
-            del new_callable.__wrapped__
-            old_params = inspect.signature(annotation).parameters
-            callable_annotations = new_callable.__annotations__
-
-            new_callable: Any = cast(Any, new_callable)
-            new_callable.__annotations__ = self._change_version_of_annotations(
-                callable_annotations,
-                version_dir,
-            )
-            new_callable.__defaults__ = self._change_version_of_annotations(
-                tuple(p.default for p in old_params.values() if p.default is not inspect.Signature.empty),
-                version_dir,
-            )
+                new_callable = _wrap_sync_callable(annotation)
+            new_callable.__annotations__ = new_annotations
+            new_callable.__defaults__ = new_defaults
             new_callable.__signature__ = _generate_signature(new_callable, old_params)
             return new_callable
         else:
@@ -419,20 +461,53 @@ class _AnnotationTransformer:
         replace "UserResponse" with the the same class but from the "v1_0_1" version.
 
         """
-        if isinstance(annotation, dict):
-            return {
-                self._change_version_of_annotations(key, version_dir): self._change_version_of_annotations(
-                    value,
-                    version_dir,
-                )
-                for key, value in annotation.items()
-            }
-
-        elif isinstance(annotation, (list, tuple)):
-            return type(annotation)(self._change_version_of_annotations(v, version_dir) for v in annotation)
-        else:
+        migrate_container = self._container_migrators.get(type(annotation))
+        if migrate_container is None:
             return self.change_versions_of_a_non_container_annotation(annotation, version_dir)
 
+        cache_key = (id(annotation), version_dir)
+        hit = self._container_cache.get(cache_key)
+        if hit is not None:
+            return hit[1]
+        new_annotation = migrate_container(self, annotation, version_dir)
+        self._container_cache[cache_key] = (annotation, new_annotation)
+        return new_annotation
+
+    def _migrate_dict(self, annotation: dict, version_dir: Path) -> dict:
+        new_items = [
+            (
+                self._change_version_of_annotations(key, version_dir),
+                self._change_version_of_annotations(value, version_dir),
+            )
+            for key, value in annotation.items()
+        ]
+        if all(
+            new_key is key and new_value is value
+            for (new_key, new_value), (key, value) in zip(new_items, annotation.items(), strict=True)
+        ):
+            return annotation
+        return dict(new_items)
+
+    def _migrate_list(self, annotation: list, version_dir: Path) -> list:
+        new_values = [self._change_version_of_annotations(value, version_dir) for value in annotation]
+        if all(new_value is value for new_value, value in zip(new_values, annotation, strict=True)):
+            return annotation
+        return new_values
+
+    def _migrate_tuple(self, annotation: tuple, version_dir: Path) -> tuple:
+        new_values = tuple(self._change_version_of_annotations(value, version_dir) for value in annotation)
+        if all(new_value is value for new_value, value in zip(new_values, annotation, strict=True)):
+            return annotation
+        return new_values
+
+    # We dispatch on exact types because annotations only ever contain these containers. Subclasses (such as
+    # namedtuple defaults) are left as is just like any other non-container value we don't know how to migrate.
+    _container_migrators: ClassVar[dict[type, Callable[..., Any]]] = {
+        dict: _migrate_dict,
+        list: _migrate_list,
+        tuple: _migrate_tuple,
+    }
+
     def _change_version_of_type(self, annotation: type, version_dir: Path):
         if issubclass(annotation, BaseModel | Enum):
             if version_dir == self.latest_version_dir:
@@ -444,16 +519,13 @@ class _AnnotationTransformer:
                         stacklevel=7,
                     )
                 else:
-                    template_dir = str(self.template_version_dir)
-                    dir_with_versions = str(self.template_version_dir.parent)
-
                     # So if it is somewhere close to version dirs (either within them or next to them),
                     # but not located in "latest",
                     # but also not located in any other version dir
                     if (
-                        source_file.startswith(dir_with_versions)
-                        and not source_file.startswith(template_dir)
-                        and any(source_file.startswith(str(d)) for d in self.version_dirs)
+                        source_file.startswith(self._dir_with_versions_str)
+                        and not source_file.startswith(self._template_dir_str)
+                        and source_file.startswith(self._version_dir_strs)
                     ):
                         raise RouterGenerationError(
                             f'"{annotation}" is not defined in "{self.template_version_dir}" even though it must be. '
@@ -466,7 +538,71 @@ class _AnnotationTransformer:
             return annotation
 
 
+def _clone_router_and_remove_deleted_routes(router: fastapi.routing.APIRouter) -> fastapi.routing.APIRouter:
+    """Copy the router and its API routes without copying everything they reference.
+
+    We only ever reassign attributes of routes (endpoint, dependant, body_field, app, etc) or change their tags,
+    so we do not need to deepcopy all the dependants and pydantic fields that versions can safely share.
+
+    The copy keeps the deleted routes because older versions can restore them. The original router is final at
+    this point so we drop its deleted routes in the same pass.
+    """
+    new_router = copy.copy(router)
+    # Router-level containers can be changed by the user after generation (add_event_handler, etc) so each
+    # version must get its own copies of them
+    new_router.tags = list(router.tags)
+    new_router.dependencies = list(router.dependencies)
+    new_router.responses = dict(router.responses)
+    new_router.callbacks = list(router.callbacks)
+    new_router.on_startup = list(router.on_startup)
+    new_router.on_shutdown = list(router.on_shutdown)
+    # Starlette stores some of the router's own bound methods as attributes (default, middleware_stack, etc) so
+    # the copy would keep calling them on the original router
+    for attr_name, value in vars(new_router).items():
+        if isinstance(value, MethodType) and value.__self__ is router:
+            setattr(new_router, attr_name, MethodType(value.__func__, new_router))
+    # Starlette's default lifespan is not a bound method but it runs the startup/shutdown handlers of the router
+    # it was created for all the same
+    if getattr(router.lifespan_context, "_router", None) is router:
+        new_router.lifespan_context = copy.copy(router.lifespan_context)
+        new_router.lifespan_context._router = new_router
+    new_router.routes = []
+    # Keeping API routes separately saves us from filtering out the other routes every time we iterate over them
+    new_router._api_routes = []
+    existing_routes = []
+    for route in router.routes:
+        if isinstance(route, APIRoute):
+            if not route._deleted:
+                existing_routes.append(route)
+            new_route = _clone_route(route)
+            new_router._api_routes.append(new_route)
+            new_router.routes.append(new_route)
+        else:
+            existing_routes.append(route)
+            new_router.routes.append(route)
+    router.routes = existing_routes
+    return new_router
+
+
+def _clone_route(route: APIRoute) -> APIRoute:
+    new_route = object.__new__(type(route))
+    new_route.__dict__ = route.__dict__.copy()
+    # Same as with routers: each version must get its own copies of the containers that the user can change
+    for attr_name in _ROUTE_CONTAINER_ATTRIBUTES:
+        value = getattr(new_route, attr_name, None)
+        if isinstance(value, (list, set, dict)):
+            setattr(new_route, attr_name, copy.copy(value))
+    # Route methods get compared on every endpoint instruction so we do not want to rebuild a set each time
+    new_route._methods_fs = frozenset(route.methods)
+    return new_route
+
+
 def _remake_endpoint_dependencies(route: fastapi.routing.APIRoute):
+    # Rebuilding the dependant and the route handler is expensive so we only do it if something they depend on changed
+    fingerprint = (route.endpoint, tuple(route.dependencies), route.path_format)
+    if getattr(route, "_deps_fingerprint", None) == fingerprint:
+        return
+    route._deps_fingerprint = fingerprint
     route.dependant = get_dependant(path=route.path_format, call=route.endpoint)
     route.body_field = get_body_field(dependant=route.dependant, name=route.unique_id)
     for depends in route.dependencies[::-1]:
@@ -495,69 +631,82 @@ def _apply_endpoint_had_instruction(
     instruction: EndpointHadInstruction,
     original_route: APIRoute,
 ):
-    for attr_name in instruction.attributes.__dataclass_fields__:
+    for attr_name in instruction.changed_attribute_names:
         attr = getattr(instruction.attributes, attr_name)
-        if attr is not Sentinel:
-            if getattr(original_route, attr_name) == attr:
-                raise RouterGenerationError(
-                    f'Expected attribute "{attr_name}" of endpoint'
-                    f' "{list(original_route.methods)} {original_route.path}"'
-                    f' to be different in "{version_change.__name__}", but it was the same.'
-                    " It means that your version change has no effect on the attribute"
-                    " and can be removed.",
-                )
-            setattr(original_route, attr_name, attr)
+        if getattr(original_route, attr_name) == attr:
+            raise RouterGenerationError(
+                f'Expected attribute "{attr_name}" of endpoint'
+                f' "{list(original_route.methods)} {original_route.path}"'
+                f' to be different in "{version_change.__name__}", but it was the same.'
+                " It means that your version change has no effect on the attribute"
+                " and can be removed.",
+            )
+        setattr(original_route, attr_name, attr)
+        # Route handler depends on most of the route's attributes so it has to be rebuilt
+        original_route._deps_fingerprint = None
+        if attr_name == "methods":
+            original_route._methods_fs = frozenset(attr)
+
+
+def _wrap_async_callable(func: Callable[..., Any]) -> Any:
+    @functools.wraps(func)
+    async def new_callable(*args: Any, **kwargs: Any) -> Any:
+        return await func(*args, **kwargs)
+
+    # Otherwise it will have the same signature as __wrapped__
+    del new_callable.__wrapped__
+    return new_callable
+
+
+def _wrap_sync_callable(func: Callable[..., Any]) -> Any:
+    @functools.wraps(func)
+    def new_callable(*args: Any, **kwargs: Any) -> Any:
+        return func(*args, **kwargs)
+
+    # Otherwise it will have the same signature as __wrapped__
+    del new_callable.__wrapped__
+    return new_callable
 
 
 def _generate_signature(
     new_callable: Callable,
     old_params: MappingProxyType[str, inspect.Parameter],
 ):
-    parameters = []
-    default_counter = 0
-    for param in old_params.values():
-        if param.default is not inspect.Signature.empty:
-            default = new_callable.__defaults__[default_counter]
-            default_counter += 1
-        else:
-            default = inspect.Signature.empty
-        parameters.append(
-            inspect.Parameter(
-                param.name,
-                param.kind,
-                default=default,
-                annotation=new_callable.__annotations__.get(
-                    param.name,
-                    inspect.Signature.empty,
-                ),
-            ),
+    defaults = iter(new_callable.__defaults__ or ())
+    annotations = new_callable.__annotations__
+    parameters = [
+        inspect.Parameter(
+            param.name,
+            param.kind,
+            default=_EMPTY if param.default is _EMPTY else next(defaults),
+            annotation=annotations.get(param.name, _EMPTY),
         )
-    return inspect.Signature(
-        parameters=parameters,
-        return_annotation=new_callable.__annotations__.get(
-            "return",
-            inspect.Signature.empty,
-        ),
-    )
+        for param in old_params.values()
+    ]
+    return inspect.Signature(parameters=parameters, return_annotation=annotations.get("return", _EMPTY))
+
+
+def _build_route_index(routes: Sequence[fastapi.routing.APIRoute]) -> dict[str, list[fastapi.routing.APIRoute]]:
+    index: dict[str, list[fastapi.routing.APIRoute]] = {}
+    for route in routes:
+        index.setdefault(route.path, []).append(route)
+    return index
 
 
 def _get_routes(
-    routes: Sequence[BaseRoute],
+    routes: dict[str, list[fastapi.routing.APIRoute]],
     endpoint_path: str,
-    endpoint_methods: Collection[str],
+    endpoint_methods: frozenset[str],
     endpoint_func_name: str | None = None,
     *,
     is_deleted: bool = False,
 ) -> list[fastapi.routing.APIRoute]:
     found_routes = []
-    endpoint_method_set = set(endpoint_methods)
-    for route in routes:
+    for route in routes.get(endpoint_path, ()):
         if (
-            isinstance(route, fastapi.routing.APIRoute)
-            and route.path == endpoint_path
-            and set(route.methods).issubset(endpoint_method_set)
+            route._methods_fs <= endpoint_methods
             and (endpoint_func_name is None or route.endpoint.__name__ == endpoint_func_name)
-            and (_DELETED_ROUTE_TAG in route.tags) == is_deleted
+            and route._deleted == is_deleted
         ):
             found_routes.append(route)
     return found_routes
@@ -1,5 +1,6 @@
+import sys
 from collections.abc import Callable, Sequence
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any, cast
 
@@ -57,6 +58,14 @@ class EndpointHadInstruction:
     endpoint_methods: Sequence[str]
     endpoint_func_name: str | None
     attributes: EndpointAttributesPayload
+    changed_attribute_names: tuple[str, ...] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.changed_attribute_names = tuple(
+            attr_name
+            for attr_name in self.attributes.__dataclass_fields__
+            if getattr(self.attributes, attr_name) is not Sentinel
+        )
 
 
 @dataclass(slots=True)
@@ -164,7 +173,14 @@ class EndpointInstructionFactory:
 
 
 def endpoint(path: str, methods: list[str], /, *, func_name: str | None = None) -> EndpointInstructionFactory:
-    return EndpointInstructionFactory(path, methods, func_name)
+    # Interned strings are compared by identity when we look routes up by their paths and methods.
+    # sys.intern only accepts exact strings so we have to convert str subclasses such as HTTPMethod first.
+    # str() would not work here because it returns "Enum.MEMBER" for (str, Enum) members.
+    return EndpointInstructionFactory(
+        sys.intern(str.__str__(path)),
+        [sys.intern(str.__str__(method)) for method in methods],
+        func_name,
+    )
 
 
 AlterEndpointSubInstruction = EndpointDidntExistInstruction | EndpointExistedInstruction | EndpointHadInstruction